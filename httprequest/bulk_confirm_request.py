@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+
+class BulkConfirmRequest(BaseModel):
+    thread_ids: list[str]
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+
+class UpdateStateItem(BaseModel):
+    thread_id: str
+    answer: str
+
+
+class BulkUpdateStateRequest(BaseModel):
+    items: list[UpdateStateItem]
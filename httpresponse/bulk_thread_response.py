@@ -0,0 +1,16 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from httpresponse.thread_response import ThreadResponse
+
+
+
+class BulkThreadItemResponse(BaseModel):
+    thread_id: str
+    status_code: int
+    detail: Optional[str] = None
+    thread: Optional[ThreadResponse] = None
+
+
+class BulkThreadResponse(BaseModel):
+    results: list[BulkThreadItemResponse]
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+
+class SourceResponse(BaseModel):
+    title: str
+    url: str
+    score: float
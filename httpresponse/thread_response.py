@@ -2,6 +2,8 @@
 from typing import Optional
 from pydantic import BaseModel
 
+from httpresponse.source_response import SourceResponse
+
 
 
 class ThreadResponse(BaseModel):
@@ -10,4 +12,5 @@ class ThreadResponse(BaseModel):
     question: Optional[str] = None
     answer: Optional[str] = None
     confirmed: bool
-    error: bool
\ No newline at end of file
+    error: bool
+    sources: list[SourceResponse] = []
\ No newline at end of file
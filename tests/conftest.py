@@ -0,0 +1,4 @@
+import os
+
+# app.py and the workflows construct OpenAI clients at import, the tests never reach the provider
+os.environ.setdefault("OPENAI_API_KEY", "test")
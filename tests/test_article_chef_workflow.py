@@ -0,0 +1,71 @@
+import pytest
+from langgraph.graph import END
+
+from workflows.article_chef_workflow import (
+    MAX_ARTICLE_WRITER_ATTEMPTS,
+    MIN_ARTICLE_WORDS,
+    ArticlePipelineConfig,
+    count_words,
+    get_article_workflow,
+)
+
+
+def graded_state(**extra):
+    return {
+        "event": "India vs Pakistan, ICC Champions Trophy, Cricket",
+        "ontopic": True,
+        "mentions_sport_name": True,
+        "mentions_team_names": True,
+        "mentions_tournament_name": True,
+        **extra,
+    }
+
+
+def article(word_count, writer_attempts=0):
+    text = " ".join(["word"] * word_count)
+    return {"text": text, "word_count": count_words(text), "writer_attempts": writer_attempts}
+
+
+@pytest.fixture
+def workflow():
+    return get_article_workflow()
+
+
+def test_count_words():
+    assert count_words("") == 0
+    assert count_words("  India beat\nPakistan  ") == 3
+
+
+def test_off_topic_or_incomplete_event_ends(workflow):
+    assert workflow.article_chef_decider(graded_state(ontopic=False)) == END
+    assert workflow.article_chef_decider(graded_state(mentions_team_names=False)) == END
+
+
+def test_search_runs_before_writing(workflow):
+    assert workflow.article_chef_decider(graded_state()) == "web_search_query_generator"
+    state = graded_state(web_search_query_generated="India vs Pakistan result")
+    assert workflow.article_chef_decider(state) == "web_searcher"
+
+
+def test_short_article_goes_to_writer(workflow):
+    state = graded_state(web_search_query_generated="query", article=article(MIN_ARTICLE_WORDS - 1))
+    assert workflow.article_chef_decider(state) == "article_writer"
+
+
+def test_long_enough_article_skips_writer(workflow):
+    state = graded_state(web_search_query_generated="query", article=article(MIN_ARTICLE_WORDS))
+    assert workflow.article_chef_decider(state) == END
+
+
+def test_writer_attempts_are_bounded(workflow):
+    state = graded_state(
+        web_search_query_generated="query",
+        article=article(MIN_ARTICLE_WORDS - 1, writer_attempts=MAX_ARTICLE_WRITER_ATTEMPTS),
+    )
+    assert workflow.article_chef_decider(state) == END
+
+
+def test_pipeline_without_writer_ends_on_short_article():
+    workflow = get_article_workflow(ArticlePipelineConfig(include_writer=False))
+    state = graded_state(web_search_query_generated="query", article=article(MIN_ARTICLE_WORDS - 1))
+    assert workflow.article_chef_decider(state) == END
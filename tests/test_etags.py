@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import Base, Thread, etag_matches, sessions_etag, thread_etag
+
+
+def test_etag_matches_weak_and_strong_forms():
+    etag = thread_etag("t1", 3)
+    assert etag == 'W/"t1-3"'
+    assert etag_matches(etag, etag)
+    assert etag_matches('"t1-3"', etag)
+
+
+def test_etag_matches_any_tag_in_a_list_or_wildcard():
+    etag = thread_etag("t1", 3)
+    assert etag_matches('W/"t1-2", W/"t1-3"', etag)
+    assert etag_matches("*", etag)
+
+
+def test_etag_does_not_match_other_versions_or_missing_header():
+    etag = thread_etag("t1", 3)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches(thread_etag("t1", 2), etag)
+
+
+def test_sessions_etag_changes_with_any_thread_version():
+    etag = sessions_etag([("t1", 1), ("t2", 1)])
+    assert etag == sessions_etag([("t1", 1), ("t2", 1)])
+    assert etag != sessions_etag([("t1", 1), ("t2", 2)])
+    assert etag != sessions_etag([("t1", 1)])
+
+
+def test_thread_version_bumps_on_change_only():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Thread(thread_id="t1", question_asked=True, confirmed=False, error=False))
+        db.commit()
+        thread = db.get(Thread, "t1")
+        assert thread.version == 1
+
+        thread.answer = "India beat Pakistan."
+        db.commit()
+        assert thread.version == 2
+
+        thread.answer = "India beat Pakistan."
+        db.commit()
+        assert thread.version == 2
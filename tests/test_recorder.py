@@ -0,0 +1,48 @@
+import json
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+
+from workflows.article_chef_workflow import ArticlePostabilityGrader
+from workflows.recorder import _decode_chat_result, _encode_chat_result
+
+
+# Answers every call with a fixed result, standing in for a replayed provider response
+class FixedResultChatOpenAI(ChatOpenAI):
+    result: ChatResult
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self.result
+
+
+def test_structured_output_chat_result_round_trips():
+    grade = ArticlePostabilityGrader(
+        ontopic=True,
+        sport_name_mentioned=True,
+        teams_mentioned=True,
+        tournament_name_mentioned=False,
+    )
+    result = ChatResult(
+        generations=[
+            ChatGeneration(
+                message=AIMessage(
+                    content=grade.model_dump_json(),
+                    additional_kwargs={"parsed": grade, "refusal": None},
+                )
+            )
+        ],
+        llm_output={"model_name": "gpt-4o-mini"},
+    )
+
+    # Recordings are stored as json lines
+    encoded = json.loads(json.dumps(_encode_chat_result(result)))
+    decoded = _decode_chat_result(encoded)
+
+    message = decoded.generations[0].message
+    assert message.content == grade.model_dump_json()
+    assert decoded.llm_output == {"model_name": "gpt-4o-mini"}
+    grader = FixedResultChatOpenAI(model="gpt-4o-mini", result=decoded).with_structured_output(
+        ArticlePostabilityGrader
+    )
+    assert grader.invoke("India vs Pakistan, ICC Champions Trophy") == grade
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    app.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(app, "SessionLocal", session_factory)
+    with session_factory() as session:
+        session.add(app.Thread(thread_id="t1", question_asked=False, confirmed=False, error=False))
+        session.commit()
+        yield session
+
+
+def add_run(db, run_id, status, claimed_by=None, heartbeat_age=None):
+    heartbeat_at = None if heartbeat_age is None else app.now_utc() - timedelta(seconds=heartbeat_age)
+    db.add(
+        app.ArticleRun(
+            run_id=run_id,
+            thread_id="t1",
+            event="India vs Pakistan, ICC Champions Trophy",
+            status=status,
+            attempts=1 if claimed_by else 0,
+            claimed_by=claimed_by,
+            heartbeat_at=heartbeat_at,
+        )
+    )
+    db.commit()
+
+
+ARTICLE = {
+    "event": "India vs Pakistan, ICC Champions Trophy",
+    "final_article": "India beat Pakistan.",
+    "error": False,
+    "sources": [],
+}
+
+
+def test_finish_run_saves_the_article_for_its_owner(db):
+    add_run(db, "r1", "running", claimed_by=app.WORKER_ID, heartbeat_age=0)
+
+    assert app.finish_run("r1", "t1", ARTICLE, "done")
+
+    db.expire_all()
+    assert db.get(app.ArticleRun, "r1").status == "done"
+    thread = db.get(app.Thread, "t1")
+    assert thread.question_asked
+    assert thread.answer == "India beat Pakistan."
+
+
+def test_finish_run_refuses_a_run_claimed_by_another_worker(db):
+    add_run(db, "r1", "running", claimed_by="other-worker", heartbeat_age=0)
+
+    assert not app.finish_run("r1", "t1", ARTICLE, "done")
+
+    db.expire_all()
+    assert db.get(app.ArticleRun, "r1").status == "running"
+    assert not db.get(app.Thread, "t1").question_asked
+
+
+@pytest.mark.parametrize("status", ["superseded", "cancelled"])
+def test_finish_run_refuses_a_run_that_is_no_longer_running(db, status):
+    add_run(db, "r1", status, claimed_by=app.WORKER_ID, heartbeat_age=0)
+
+    assert not app.finish_run("r1", "t1", ARTICLE, "done")
+
+    db.expire_all()
+    assert db.get(app.ArticleRun, "r1").status == status
+    assert db.get(app.Thread, "t1").answer is None
+
+
+def test_claim_run_skips_fresh_and_superseded_runs(db):
+    add_run(db, "fresh", "running", claimed_by="other-worker", heartbeat_age=1)
+    add_run(db, "superseded", "superseded", claimed_by="other-worker", heartbeat_age=app.RUN_STALE_SECONDS * 2)
+
+    assert app.claim_run(db) is None
+
+
+def test_claim_run_takes_over_a_stale_run(db):
+    add_run(db, "stale", "running", claimed_by="other-worker", heartbeat_age=app.RUN_STALE_SECONDS * 2)
+
+    run = app.claim_run(db)
+
+    assert run.run_id == "stale"
+    assert run.claimed_by == app.WORKER_ID
+    assert run.attempts == 2
+
+
+def test_claim_run_takes_a_queued_run(db):
+    add_run(db, "fresh", "running", claimed_by="other-worker", heartbeat_age=1)
+    add_run(db, "queued", "queued")
+
+    run = app.claim_run(db)
+
+    assert run.run_id == "queued"
+    assert run.status == "running"
+    assert run.attempts == 1
@@ -1,131 +1,258 @@
-from typing import Literal, TypedDict
+from functools import lru_cache
+from typing import Literal, Optional, TypedDict
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .article_writer import create_article_writer_agent
-from .web_search import create_web_search_agent
+from .deadlines import LLM_TIMEOUT_SECONDS, run_with_deadline
+from .llm_cache import llm_response_cache
+from .recorder import RecordingChatOpenAI, golden_recorder
+from .web_search import WebSearchSource, create_web_search_agent
 from .web_search_query_generator import create_web_search_query_generator_agent
 
+MIN_ARTICLE_WORDS = 100
+MAX_ARTICLE_WRITER_ATTEMPTS = 2
 
-class ArticlePostabilityGrader(BaseModel):
-    """Binary scores for verifying if an article mentions sport name, team names, tournament name, and meets the minimum word count of 100 words."""
 
-    ontopic: str = Field(
-        description="The Article is about a sport event, 'yes' or 'no'"
-    )
-    sport_name_mentioned: str = Field(
-        description="The article mentions the name of the sport, 'yes' or 'no'"
+# Dedented module constant so the grader prefix is byte-stable across calls, the chain using it is built once per workflow
+POSTABILITY_GRADER_PROMPT = """\
+You are a grader assessing whether a event information meets the following criteria:
+1. The event is about sports or not. If yes answer, answer with true for ontopic, otherwise with false.
+2. The event explicitly mentions the name of the sport (e.g., "Cricket" or "Football" or "Hockey".etc.). If it is present answer with true for sport_name_mentioned, otherwise respond with false.
+3. The event explicitly mentions the sport event details, for example, by stating "2 team names" for a team sport or "2 player names" for a individual sport (e.g., "India vs Pakistan" or "Roger Federer vs Rafael Nadal"). If this is present, respond with true for teams_mentioned; otherwise, respond false.
+4. The event mentions the tournament name (e.g. "ICC Champions Trophy" or "World Cup" or "English Premier League" or "Asia Cup" or "Wimbledon" or "French Open"). If it is present answer with true for tournament_name_mentioned; otherwise answer with false.
+
+Provide four binary scores (true or false) as follows:
+- ontopic: true or false depending on whether the article is related to a sport event.
+- sport_name_mentioned: true or false depending on whether the article mentions the name of the sport.
+- teams_mentioned: true or false depending on whether the article mentions the name of 2 players or 2 teams.
+- tournament_name_mentioned: true or false depending on whether the article mentions the name of the tournament.
+"""
+
+# Prompts used when grading is split, the mentions grader only runs for sport events
+TOPIC_GRADER_PROMPT = """\
+You are a grader assessing whether a event information is about sports or not.
+If it is about a sport event answer with true for ontopic, otherwise with false.
+"""
+
+MENTIONS_GRADER_PROMPT = """\
+You are a grader assessing whether a sport event information meets the following criteria:
+1. The event explicitly mentions the name of the sport (e.g., "Cricket" or "Football" or "Hockey".etc.). If it is present answer with true for sport_name_mentioned, otherwise respond with false.
+2. The event explicitly mentions the sport event details, for example, by stating "2 team names" for a team sport or "2 player names" for a individual sport (e.g., "India vs Pakistan" or "Roger Federer vs Rafael Nadal"). If this is present, respond with true for teams_mentioned; otherwise, respond false.
+3. The event mentions the tournament name (e.g. "ICC Champions Trophy" or "World Cup" or "English Premier League" or "Asia Cup" or "Wimbledon" or "French Open"). If it is present answer with true for tournament_name_mentioned; otherwise answer with false.
+
+Provide three binary scores (true or false) as follows:
+- sport_name_mentioned: true or false depending on whether the article mentions the name of the sport.
+- teams_mentioned: true or false depending on whether the article mentions the name of 2 players or 2 teams.
+- tournament_name_mentioned: true or false depending on whether the article mentions the name of the tournament.
+"""
+
+
+def count_words(text: str) -> int:
+    """Count whitespace separated words in a candidate article."""
+    return len(text.split()) if text else 0
+
+
+class TopicGrader(BaseModel):
+    """Binary score for verifying if an article is about a sport event."""
+
+    ontopic: bool = Field(
+        description="The Article is about a sport event, true or false"
     )
-    teams_mentioned: str = Field(
-        description="The article mentions the 2 team names or 2 individual player names, 'yes' or 'no'"
+
+
+class MentionsGrader(BaseModel):
+    """Binary scores for verifying if an article mentions sport name, team names and tournament name."""
+
+    sport_name_mentioned: bool = Field(
+        description="The article mentions the name of the sport, true or false"
     )
-    tournament_name_mentioned: str = Field(
-        description="The article mentions the name of the tournament, 'yes' or 'no'"
+    teams_mentioned: bool = Field(
+        description="The article mentions the 2 team names or 2 individual player names, true or false"
     )
-    meets_100_words: str = Field(
-        description="The article has at least 100 words, 'yes' or 'no'"
+    tournament_name_mentioned: bool = Field(
+        description="The article mentions the name of the tournament, true or false"
     )
 
 
+class ArticlePostabilityGrader(TopicGrader, MentionsGrader):
+    """Binary scores for verifying if an article is about a sport event and mentions sport name, team names and tournament name."""
+
+
+class ArticlePipelineConfig(BaseModel):
+    """Configuration of an article pipeline variant, compiled pipelines are cached per configuration."""
+
+    model_config = ConfigDict(frozen=True)
+
+    # Model used by every agent of the pipeline
+    llm_model: str = "gpt-4o-mini"
+    # Grader temperature, the other agents keep the model default
+    temperature: float = 0
+    include_writer: bool = True
+    fused_grading: bool = True
+
+
+class Article(TypedDict):
+    text: str
+    word_count: int
+    writer_attempts: int
+
+
 class InputArticleState(TypedDict):
     event: str
 
 
 class OutputFinalArticleState(TypedDict):
-    final_article: str
-    ontopic: str
+    article: Article
+    sources: list[WebSearchSource]
+    ontopic: bool
 
 
 class SharedArticleState(InputArticleState, OutputFinalArticleState):
-    mentions_sport_name: str
-    mentions_team_names: str
-    mentions_tournament_name: str
-    web_search_result: str
+    mentions_sport_name: bool
+    mentions_team_names: bool
+    mentions_tournament_name: bool
     web_search_query_generated: str
-    meets_100_words: str
+
+
+# Grader clients are shared by every pipeline variant using the same model settings
+@lru_cache(maxsize=None)
+def _create_grader_llm(llm_model: str, temperature: float) -> RecordingChatOpenAI:
+    # Only deterministic grading is safe to answer from the exact match response cache,
+    # golden runs bypass it so every provider call ends up in the recording
+    use_cache = temperature == 0 and not golden_recorder.enabled
+    return RecordingChatOpenAI(
+        model=llm_model,
+        temperature=temperature,
+        cache=llm_response_cache if use_cache else False,
+    )
+
+
+_article_workflows: dict[ArticlePipelineConfig, "ArticleWorkflow"] = {}
+
+
+def get_article_workflow(pipeline_config: Optional[ArticlePipelineConfig] = None) -> "ArticleWorkflow":
+    """Return the compiled article pipeline for a configuration, building it on first use.
+
+    The subagent factories are lru_cached per model, so variants using the same model share the compiled subagents.
+    """
+    pipeline_config = pipeline_config or ArticlePipelineConfig()
+    if pipeline_config not in _article_workflows:
+        _article_workflows[pipeline_config] = ArticleWorkflow(pipeline_config)
+    return _article_workflows[pipeline_config]
 
 
 # Article Chef agent, Supervises web_search_query_generator, web_search and article_writer agent
 class ArticleWorkflow:
-    def __init__(self, llm_model="gpt-4o-mini", temperature=0):
-        self.web_search_query_generator_agent = create_web_search_query_generator_agent()
-        self.web_search_agent = create_web_search_agent()
-        self.article_writer_agent = create_article_writer_agent()
-        self.llm_postability = ChatOpenAI(model=llm_model, temperature=temperature)
+    def __init__(self, pipeline_config: Optional[ArticlePipelineConfig] = None):
+        self.pipeline_config = pipeline_config or ArticlePipelineConfig()
+        llm_model = self.pipeline_config.llm_model
+        self.web_search_query_generator_agent = create_web_search_query_generator_agent(llm_model)
+        self.web_search_agent = create_web_search_agent(llm_model)
+        self.article_writer_agent = (
+            create_article_writer_agent(llm_model) if self.pipeline_config.include_writer else None
+        )
+        self.llm_postability = _create_grader_llm(
+            self.pipeline_config.llm_model, self.pipeline_config.temperature
+        )
+        if self.pipeline_config.fused_grading:
+            self.postability_grader = self._create_grader(POSTABILITY_GRADER_PROMPT, ArticlePostabilityGrader)
+        else:
+            self.topic_grader = self._create_grader(TOPIC_GRADER_PROMPT, TopicGrader)
+            self.mentions_grader = self._create_grader(MENTIONS_GRADER_PROMPT, MentionsGrader)
         self.workflow = self._create_workflow()
 
-    def _create_postability_grader(self):
-        prompt_template = """
-        You are a grader assessing whether a event information meets the following criteria:
-        1. The event is about sports or not. If yes answer, answer with 'yes' for ontopic, otherwise with 'no'.
-        2. The event explicitly mentions the name of the sport (e.g., "Cricket" or "Football" or "Hockey".etc.). If it is present answer with 'yes' for sport_name_mentioned, otherwise respond with 'no'.
-        3. The event explicitly mentions the sport event details, for example, by stating "2 team names" for a team sport or "2 player names" for a individual sport (e.g., "India vs Pakistan" or "Roger Federer vs Rafael Nadal"). If this is present, respond with 'yes' for teams_mentioned; otherwise, respond 'no'.
-        4. The event mentions the tournament name (e.g. "ICC Champions Trophy" or "World Cup" or "English Premier League" or "Asia Cup" or "Wimbledon" or "French Open"). If it is present answer with 'yes' for tournament_name_mentioned; otherwise answer with 'no'.
-        5. The event contains at least 100 words. If this is met, respond with 'yes' for meets_100_words; otherwise, respond 'no'.
-
-        Provide four binary scores ('yes' or 'no') as follows:
-        - ontopic: 'yes' or 'no' depending on whether the article is related to a sport event.
-        - sport_name_mentioned: 'yes' or 'no' depending on whether the article mentions the name of the sport.
-        - teams_mentioned: 'yes' or 'no' depending on whether the article mentions the name of 2 players or 2 teams.
-        - tournament_name_mentioned: 'yes' or 'no' depending on whether the article mentions the name of the tournament.
-        - meets_100_words: 'yes' or 'no' depending on whether the article has at least 100 words.
-        """
-        postability_system = ChatPromptTemplate.from_messages(
-            [("system", prompt_template), ("human", "Event:\n\n{event}")]
+    def _create_grader(self, prompt: str, schema: type[BaseModel]):
+        grader_system = ChatPromptTemplate.from_messages(
+            [("system", prompt), ("human", "Event:\n\n{event}")]
         )
-        return postability_system | self.llm_postability.with_structured_output(
-            ArticlePostabilityGrader
+        return grader_system | self.llm_postability.with_structured_output(schema)
+
+    async def _grade(self, grader, state: SharedArticleState, config: RunnableConfig):
+        return await run_with_deadline(
+            grader.ainvoke({"event": state["event"]}, config),
+            config,
+            LLM_TIMEOUT_SECONDS,
         )
 
-    async def update_event_state(self, state: SharedArticleState) -> SharedArticleState:
-        article_chef = self._create_postability_grader()
-        states_to_check = ["ontopic", "mentions_sport_name", "mentions_team_names", "mentions_tournament_name", "meets_100_words"]
-        if not all(key in state for key in states_to_check):
-            response = await article_chef.ainvoke({"event": state["event"]})
-            state["ontopic"] = response.ontopic
-            state["mentions_sport_name"] = response.sport_name_mentioned
-            state["mentions_team_names"] = response.teams_mentioned
-            state["mentions_tournament_name"] = response.tournament_name_mentioned
-            state["meets_100_words"] = response.meets_100_words
+    @staticmethod
+    def _mentions_update(response: MentionsGrader) -> dict:
+        return {
+            "mentions_sport_name": response.sport_name_mentioned,
+            "mentions_team_names": response.teams_mentioned,
+            "mentions_tournament_name": response.tournament_name_mentioned,
+        }
+
+    # Nodes return only the keys they change, keeping checkpoint writes small
+    async def update_event_state(self, state: SharedArticleState, config: RunnableConfig) -> dict:
+        mentions_to_check = ["mentions_sport_name", "mentions_team_names", "mentions_tournament_name"]
+        update = {}
+        if self.pipeline_config.fused_grading:
+            if not all(key in state for key in ["ontopic"] + mentions_to_check):
+                response = await self._grade(self.postability_grader, state, config)
+                update["ontopic"] = response.ontopic
+                update.update(self._mentions_update(response))
+        else:
+            # The mentions grader is skipped entirely for events that are not about sports
+            ontopic = state.get("ontopic")
+            if ontopic is None:
+                response = await self._grade(self.topic_grader, state, config)
+                ontopic = update["ontopic"] = response.ontopic
+            if ontopic and not all(key in state for key in mentions_to_check):
+                response = await self._grade(self.mentions_grader, state, config)
+                update.update(self._mentions_update(response))
 
-        return state
+        return update
 
     # Web search query generator node, Calls Query Generator Agent
-    async def web_search_query_gen_node(self, state: SharedArticleState) -> SharedArticleState:
-        response = await self.web_search_query_generator_agent.ainvoke({"event": state["event"]})
-        state["web_search_query_generated"] = f"{response['agent_output']}"
-        return state
+    async def web_search_query_gen_node(self, state: SharedArticleState, config: RunnableConfig) -> dict:
+        response = await self.web_search_query_generator_agent.ainvoke({"event": state["event"]}, config)
+        return {"web_search_query_generated": response["agent_output"]}
 
     # Web Search node, Calls Web Search Agent
-    async def web_search_node(self, state: SharedArticleState) -> SharedArticleState:
-        response = await self.web_search_agent.ainvoke({"web_search_query": state["web_search_query_generated"]})
-        state["web_search_result"] = f"{response['agent_output']}"
-        return state
-
-    # Article writer mode, calls article writer agent
-    async def article_writer_node(self, state: SharedArticleState) -> SharedArticleState:
-        response = await self.article_writer_agent.ainvoke({"web_search_result": state["web_search_result"]})
-        state["final_article"] = response["agent_output"]
-        state["meets_100_words"] = "yes"
-        return state
+    async def web_search_node(self, state: SharedArticleState, config: RunnableConfig) -> dict:
+        response = await self.web_search_agent.ainvoke({"web_search_query": state["web_search_query_generated"]}, config)
+        # The search summary is the first article candidate, the writer is only needed if it is too short
+        return {
+            "sources": response.get("sources", []),
+            "article": self._article(response["agent_output"], writer_attempts=0),
+        }
+
+    # Article writer mode, calls article writer agent to expand the current candidate
+    async def article_writer_node(self, state: SharedArticleState, config: RunnableConfig) -> dict:
+        response = await self.article_writer_agent.ainvoke({"web_search_result": state["article"]["text"]}, config)
+        return {
+            "article": self._article(
+                response["agent_output"],
+                writer_attempts=state["article"]["writer_attempts"] + 1,
+            )
+        }
+
+    @staticmethod
+    def _article(text: str, writer_attempts: int) -> Article:
+        return Article(text=text, word_count=count_words(text), writer_attempts=writer_attempts)
 
     # decides what agent to call next
     def article_chef_decider(self,state: SharedArticleState,) -> Literal["web_search_query_generator", "web_searcher", "article_writer", END]: # type: ignore
         if (
-            state["ontopic"] == "no" 
-            or state["mentions_sport_name"] == "no" 
-            or state["mentions_team_names"] == "no" 
-            or state["mentions_tournament_name"] == "no"
+            not state["ontopic"]
+            or state.get("mentions_sport_name") is False
+            or state.get("mentions_team_names") is False
+            or state.get("mentions_tournament_name") is False
             ):
             return END
         elif "web_search_query_generated" not in state:
             next_node = "web_search_query_generator"
-        elif "web_search_result" not in state:
+        elif "article" not in state:
             next_node = "web_searcher"
-        elif state["meets_100_words"] == "no":
+        elif (
+            self.pipeline_config.include_writer
+            and state["article"]["word_count"] < MIN_ARTICLE_WORDS
+            and state["article"]["writer_attempts"] < MAX_ARTICLE_WRITER_ATTEMPTS
+            ):
             next_node = "article_writer"
         else:
             next_node = END
@@ -139,20 +266,18 @@ class ArticleWorkflow:
         workflow.add_node("article_chef", self.update_event_state)
         workflow.add_node("web_search_query_generator", self.web_search_query_gen_node)
         workflow.add_node("web_searcher", self.web_search_node)
-        workflow.add_node("article_writer", self.article_writer_node)
+        routes = {
+            "web_search_query_generator": "web_search_query_generator",
+            "web_searcher": "web_searcher",
+            END: END,
+        }
+        if self.pipeline_config.include_writer:
+            workflow.add_node("article_writer", self.article_writer_node)
+            workflow.add_edge("article_writer", "article_chef")
+            routes["article_writer"] = "article_writer"
         workflow.set_entry_point("article_chef")
-        workflow.add_conditional_edges(
-            "article_chef",
-            self.article_chef_decider,
-            {
-                "web_search_query_generator": "web_search_query_generator",
-                "web_searcher": "web_searcher",
-                "article_writer": "article_writer",
-                END: END,
-            },
-        )
+        workflow.add_conditional_edges("article_chef", self.article_chef_decider, routes)
         workflow.add_edge("web_searcher", "article_chef")
-        workflow.add_edge("article_writer", "article_chef")
         workflow.add_edge("web_search_query_generator", "article_chef")
 
         return workflow.compile()
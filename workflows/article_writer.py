@@ -1,9 +1,15 @@
+from functools import lru_cache
 from typing import TypedDict
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 
+from .deadlines import LLM_TIMEOUT_SECONDS, run_with_deadline
+from .recorder import RecordingChatOpenAI
+
+ARTICLE_WRITER_PROMPT = "Expand the following text to be at least 100 words. Maintain the original meaning while adding detail. Treat the original text as credible source. Just expand the text, no interpretation or anything else!"
+
 
 class InputState(TypedDict):
     web_search_result: str
@@ -17,17 +23,19 @@ class OverallState(InputState, OutputState):
     pass
 
 
-def create_article_writer_agent():
-    model_article_writer = ChatOpenAI(model="gpt-4o-mini")
+@lru_cache(maxsize=None)
+def create_article_writer_agent(llm_model: str):
+    model_article_writer = RecordingChatOpenAI(model=llm_model)
+    system_message = SystemMessage(content=ARTICLE_WRITER_PROMPT)
 
-    async def write_article(state: OverallState):
+    async def write_article(state: OverallState, config: RunnableConfig):
         human_message = HumanMessage(content=state["web_search_result"])
-        system_message = SystemMessage(
-            content="Expand the following text to be at least 100 words. Maintain the original meaning while adding detail. Treat the original text as credible source. Just expand the text, no interpretation or anything else!"
+        response = await run_with_deadline(
+            model_article_writer.ainvoke([system_message, human_message], config),
+            config,
+            LLM_TIMEOUT_SECONDS,
         )
-        response = await model_article_writer.ainvoke([system_message, human_message])
-        state["agent_output"] = response.content
-        return state
+        return {"agent_output": response.content}
 
     article_writer_graph = StateGraph(OverallState, input=InputState, output=OutputState)
     article_writer_graph.add_node("write_article", write_article)
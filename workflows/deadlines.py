@@ -0,0 +1,39 @@
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from langchain_core.runnables import RunnableConfig
+
+T = TypeVar("T")
+
+# Upper bound for a single stage, the run deadline can cut a stage shorter
+LLM_TIMEOUT_SECONDS = 30
+WEB_SEARCH_TIMEOUT_SECONDS = 30
+
+
+def deadline_after(seconds: float) -> float:
+    """Monotonic deadline to be placed in config["configurable"]["deadline"]."""
+    return time.monotonic() + seconds
+
+
+def remaining_time(config: Optional[RunnableConfig]) -> Optional[float]:
+    """Seconds left before the run deadline, None when the run has no deadline."""
+    deadline = (config or {}).get("configurable", {}).get("deadline")
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+async def run_with_deadline(
+    awaitable: Awaitable[T], config: Optional[RunnableConfig], stage_timeout: float
+) -> T:
+    """Await a stage bounded by its own timeout and by the run deadline."""
+    timeout = stage_timeout
+    remaining = remaining_time(config)
+    if remaining is not None:
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise TimeoutError("Run deadline exceeded")
+        timeout = min(timeout, remaining)
+    return await asyncio.wait_for(awaitable, timeout)
@@ -1,8 +1,10 @@
-from typing import TypedDict
+from typing import Optional, TypedDict
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
 
-from .article_chef_workflow import ArticleWorkflow
+from .article_chef_workflow import ArticlePipelineConfig, get_article_workflow
+from .web_search import WebSearchSource
 
 
 class InputState(TypedDict):
@@ -11,23 +13,24 @@ class InputState(TypedDict):
 
 class IntermediateState(InputState):
     final_article: str
+    sources: list[WebSearchSource]
     error: bool
-    ontopic: str
+    ontopic: bool
 
 
 class FinalState(IntermediateState):
-    confirmed: str
+    confirmed: bool
 
 #Human workflow agent
 class HumanWorkflow:
-    def __init__(self):
-        self.app = ArticleWorkflow()
+    def __init__(self, pipeline_config: Optional[ArticlePipelineConfig] = None):
+        self.app = get_article_workflow(pipeline_config)
         self.checkpointer = None
         self.workflow = None
 
     def set_checkpointer(self, checkpointer):
         self.checkpointer = checkpointer
-        self.workflow = self.init_create_workflow()
+        self.init_create_workflow()
     
     def init_create_workflow(self):
         self.workflow = self._create_workflow()
@@ -44,24 +47,28 @@ class HumanWorkflow:
             interrupt_after=["newsagent_node"],
         )
 
-    async def newsagent_node(self, state: IntermediateState) -> IntermediateState:
+    async def newsagent_node(self, state: IntermediateState, config: RunnableConfig) -> dict:
         try:
             print("Event: " + state["event"])
-            response = await self.app.ainvoke({"event": state["event"]})
-            state["final_article"] = response.get(
-                "final_article", "Article not relevant for news agency"
-            )
-            state["ontopic"] = response["ontopic"]
-            state["error"] = False
+            # config carries the run deadline down into every subgraph node
+            response = await self.app.ainvoke({"event": state["event"]}, config)
+            article = response.get("article")
+            return {
+                "final_article": article["text"] if article else "Article not relevant for news agency",
+                "sources": response.get("sources", []),
+                "ontopic": response["ontopic"],
+                "error": False,
+            }
         except Exception as e:
-            state["final_Article"] = "Error occured while creating a message"
-            state["error"] = True
             print(f"Error invoking newsagent_node: {e}")
-        return state
+            return {
+                "final_article": "Error occured while creating a message",
+                "sources": [],
+                "error": True,
+            }
 
-    def confirm_node(self, state: FinalState) -> FinalState:
-        state["confirmed"] = "true"
-        return state
+    def confirm_node(self, state: FinalState) -> dict:
+        return {"confirmed": True}
 
     async def ainvoke(self, *args, **kwargs):
         if not self.workflow:
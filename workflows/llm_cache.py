@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration
+from pydantic import BaseModel
+from sqlalchemy import Column, MetaData, String, Table, Text, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+
+metadata = MetaData()
+
+# Postgres backing table, shared between processes and kept across restarts
+llm_cache_table = Table(
+    "llm_response_cache",
+    metadata,
+    Column("key", String(64), primary_key=True),
+    Column("response", Text, nullable=False),
+)
+
+
+def serializable_generations(generations: RETURN_VAL_TYPE) -> RETURN_VAL_TYPE:
+    """Copy generations so that dumps/loads round-trips them.
+
+    Structured output puts the parsed pydantic instance into additional_kwargs["parsed"],
+    which dumps cannot serialize. The output parser also accepts a plain dict there.
+    """
+    result = []
+    for generation in generations:
+        message = getattr(generation, "message", None)
+        parsed = message.additional_kwargs.get("parsed") if message is not None else None
+        if isinstance(parsed, BaseModel):
+            additional_kwargs = {**message.additional_kwargs, "parsed": parsed.model_dump()}
+            generation = ChatGeneration(
+                message=message.model_copy(update={"additional_kwargs": additional_kwargs}),
+                generation_info=generation.generation_info,
+            )
+        result.append(generation)
+    return result
+
+
+# Exact match LLM response cache, keyed on the model parameters and the serialized messages
+class LLMResponseCache(BaseCache):
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.engine: Optional[Engine] = None
+        self._entries: "OrderedDict[str, RETURN_VAL_TYPE]" = OrderedDict()
+        self._lock = Lock()
+
+    def enable_postgres(self, engine: Engine):
+        metadata.create_all(bind=engine)
+        self.engine = engine
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return sha256(f"{llm_string}\n{prompt}".encode()).hexdigest()
+
+    def _remember(self, key: str, return_val: RETURN_VAL_TYPE):
+        with self._lock:
+            self._entries[key] = return_val
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if self.engine is None:
+            return None
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                select(llm_cache_table.c.response).where(llm_cache_table.c.key == key)
+            ).first()
+        if not row:
+            return None
+        try:
+            return_val = loads(row.response)
+        except Exception as e:
+            # An unreadable entry would fail every later call for this prompt, drop it
+            print(f"Discarding unreadable LLM cache entry {key}: {e}")
+            with self.engine.begin() as connection:
+                connection.execute(llm_cache_table.delete().where(llm_cache_table.c.key == key))
+            return None
+        self._remember(key, return_val)
+        return return_val
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        key = self._key(prompt, llm_string)
+        self._remember(key, return_val)
+        if self.engine is None:
+            return
+        with self.engine.begin() as connection:
+            connection.execute(
+                insert(llm_cache_table)
+                .values(key=key, response=dumps(serializable_generations(return_val)))
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+
+    def clear(self, **kwargs: Any):
+        with self._lock:
+            self._entries.clear()
+        if self.engine is not None:
+            with self.engine.begin() as connection:
+                connection.execute(llm_cache_table.delete())
+
+
+# Shared by the deterministic (temperature 0) grader calls
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain_core.load import dumpd, load
+from langchain_core.outputs import ChatResult
+from langchain_openai import ChatOpenAI
+
+from .llm_cache import serializable_generations
+
+# off, record or replay
+GOLDEN_RUN_MODE = os.getenv("GOLDEN_RUN_MODE", "off")
+GOLDEN_RUN_DIR = os.getenv("GOLDEN_RUN_DIR", "golden_runs")
+# Multiplier applied to recorded latencies on replay, 0 replays without waiting
+GOLDEN_RUN_LATENCY_SCALE = float(os.getenv("GOLDEN_RUN_LATENCY_SCALE", "1"))
+
+# Name of the recording the current run writes to or replays from, usually the thread id
+current_golden_run: ContextVar[Optional[str]] = ContextVar("current_golden_run", default=None)
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed run makes a call that is not in its recording."""
+
+
+# Records LLM and web search calls per run into jsonl files and replays them offline
+class GoldenRunRecorder:
+    def __init__(self, mode: str = "off", directory: str = "golden_runs", latency_scale: float = 1.0):
+        self.configure(mode, directory, latency_scale)
+
+    def configure(self, mode: str, directory: Optional[str] = None, latency_scale: Optional[float] = None):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown golden run mode: {mode}")
+        self.mode = mode
+        if directory is not None:
+            self.directory = Path(directory)
+        if latency_scale is not None:
+            self.latency_scale = latency_scale
+        self._replays: dict[str, dict[str, deque]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.jsonl"
+
+    @staticmethod
+    def request_key(kind: str, request: dict) -> str:
+        payload = json.dumps({"kind": kind, "request": request}, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _append(self, name: str, entry: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.path(name).open("a") as recording:
+            recording.write(json.dumps(entry, default=repr) + "\n")
+
+    def _load(self, name: str) -> dict[str, deque]:
+        if name not in self._replays:
+            if not self.path(name).exists():
+                raise ReplayMissError(f"No recording found for golden run {name}")
+            calls = defaultdict(deque)
+            with self.path(name).open() as recording:
+                for line in recording:
+                    entry = json.loads(line)
+                    if entry["kind"] != "run":
+                        calls[entry["key"]].append(entry)
+            self._replays[name] = calls
+        return self._replays[name]
+
+    def recorded_event(self, name: str) -> str:
+        with self.path(name).open() as recording:
+            for line in recording:
+                entry = json.loads(line)
+                if entry["kind"] == "run":
+                    return entry["event"]
+        raise ReplayMissError(f"Recording {name} has no run event")
+
+    def start_run(self, name: str, event: str):
+        if self.mode == "record":
+            self._append(name, {"kind": "run", "event": event, "recorded_at": time.time()})
+
+    async def acall(
+        self,
+        kind: str,
+        request: dict,
+        call: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = lambda response: response,
+        decode: Callable[[Any], Any] = lambda response: response,
+    ) -> Any:
+        """Run, record or replay one external call of the current golden run."""
+        name = current_golden_run.get()
+        if self.mode == "off" or name is None:
+            return await call()
+        key = self.request_key(kind, request)
+        if self.mode == "replay":
+            calls = self._load(name).get(key)
+            if not calls:
+                raise ReplayMissError(f"No recorded {kind} call for golden run {name}")
+            entry = calls.popleft()
+            if self.latency_scale > 0:
+                await asyncio.sleep(entry["duration"] * self.latency_scale)
+            return decode(entry["response"])
+        started = time.perf_counter()
+        response = await call()
+        self._append(
+            name,
+            {
+                "kind": kind,
+                "key": key,
+                "request": request,
+                "response": encode(response),
+                "duration": time.perf_counter() - started,
+            },
+        )
+        return response
+
+
+golden_recorder = GoldenRunRecorder(GOLDEN_RUN_MODE, GOLDEN_RUN_DIR, GOLDEN_RUN_LATENCY_SCALE)
+
+
+@contextmanager
+def golden_run(name: str, event: Optional[str] = None):
+    """Attribute the external calls made inside the block to the named recording."""
+    token = current_golden_run.set(name)
+    try:
+        if event is not None:
+            golden_recorder.start_run(name, event)
+        yield
+    finally:
+        current_golden_run.reset(token)
+
+
+def _encode_chat_result(result: ChatResult) -> dict:
+    return {"generations": dumpd(serializable_generations(result.generations)), "llm_output": result.llm_output}
+
+
+def _decode_chat_result(response: dict) -> ChatResult:
+    return ChatResult(generations=load(response["generations"]), llm_output=response["llm_output"])
+
+
+# ChatOpenAI whose provider calls go through the golden run recorder
+class RecordingChatOpenAI(ChatOpenAI):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        # Only the fields that reach the provider, so replays match regardless of message ids
+        request = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "messages": [
+                {
+                    "type": message.type,
+                    "content": message.content,
+                    "tool_calls": getattr(message, "tool_calls", None),
+                    "tool_call_id": getattr(message, "tool_call_id", None),
+                }
+                for message in messages
+            ],
+            "stop": stop,
+            "kwargs": kwargs,
+        }
+        return await golden_recorder.acall(
+            "llm",
+            request,
+            lambda: super(RecordingChatOpenAI, self)._agenerate(messages, stop, run_manager, **kwargs),
+            encode=_encode_chat_result,
+            decode=_decode_chat_result,
+        )
@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from .recorder import golden_recorder, golden_run
+
+
+async def replay_golden_run(name: str, latency_scale: Optional[float] = None) -> dict:
+    """Run HumanWorkflow offline from a recording and report the final state and wall time."""
+    golden_recorder.configure("replay", latency_scale=latency_scale)
+    # Clients are still constructed on replay, they just never reach the network
+    os.environ.setdefault("OPENAI_API_KEY", "replay")
+    from .human_workflow import HumanWorkflow
+
+    human_workflow = HumanWorkflow()
+    human_workflow.set_checkpointer(MemorySaver())
+    event = golden_recorder.recorded_event(name)
+    started = time.perf_counter()
+    with golden_run(name):
+        state = await human_workflow.ainvoke(
+            input={"event": event},
+            config={"recursion_limit": 15, "configurable": {"thread_id": name}},
+        )
+    return {
+        "name": name,
+        "event": event,
+        "elapsed_seconds": time.perf_counter() - started,
+        "error": state.get("error", False),
+        "final_article": state.get("final_article"),
+    }
+
+
+# Replays every recording in the golden run directory, or the ones given on the command line
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded article runs offline")
+    parser.add_argument("names", nargs="*", help="recording names, defaults to all recordings")
+    parser.add_argument("--dir", default=None, help="directory holding the recordings")
+    parser.add_argument("--latency-scale", type=float, default=None, help="multiplier for recorded latencies, 0 disables waiting")
+    args = parser.parse_args()
+
+    if args.dir:
+        golden_recorder.configure("replay", directory=args.dir)
+    names = args.names or sorted(path.stem for path in golden_recorder.directory.glob("*.jsonl"))
+    failed = False
+    for name in names:
+        result = asyncio.run(replay_golden_run(name, args.latency_scale))
+        failed = failed or result["error"]
+        print(json.dumps(result))
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,39 @@
+from functools import lru_cache
 from operator import add
 from typing import Annotated, List, Literal, TypedDict
 
 from dotenv import load_dotenv
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
 from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import ToolNode
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
+
+from .deadlines import LLM_TIMEOUT_SECONDS, WEB_SEARCH_TIMEOUT_SECONDS, run_with_deadline
+from .recorder import RecordingChatOpenAI, golden_recorder
 
 
 # Load environment variables
 load_dotenv()
 
+WEB_SEARCH_AGENT_PROMPT = """You are an agent tasked with fetching information about a sports event.
+If the information about the sports event is available, return it. Otherwise, return 'Sports event information not available.'"""
+
+TAVILY_SEARCH_PARAMS = {
+    "search_depth": "advanced",
+    "topic": "news",
+    "days": 10,
+    "max_results": 5,
+    "include_answer": True,
+}
+
+
+class WebSearchSource(TypedDict):
+    title: str
+    url: str
+    score: float
+
 
 class InputState(TypedDict):
     web_search_query: str
@@ -20,47 +41,73 @@ class InputState(TypedDict):
 
 class OutputState(TypedDict):
     agent_output: str
+    sources: List[WebSearchSource]
 
 
 class OverallState(InputState, OutputState):
     messages: Annotated[List[BaseMessage], add]
 
 
-@tool
-def get_web_search_results(web_search_query: str):
+# The text goes to the LLM, the structured sources travel as the tool message artifact
+@tool(response_format="content_and_artifact")
+async def get_web_search_results(web_search_query: str, config: RunnableConfig):
     """Get Web Search results"""
-    client = TavilyClient()
-    res = client.search(web_search_query, search_depth="advanced", topic = "news", days= 10, max_results= 5, include_answer=True, include_raw_content=True)
+    # The client is only created for live calls, replayed runs need no Tavily key
+    res = await run_with_deadline(
+        golden_recorder.acall(
+            "web_search",
+            {"query": web_search_query, **TAVILY_SEARCH_PARAMS},
+            lambda: AsyncTavilyClient().search(web_search_query, **TAVILY_SEARCH_PARAMS),
+        ),
+        config,
+        WEB_SEARCH_TIMEOUT_SECONDS,
+    )
+    sources = [
+        WebSearchSource(
+            title=result.get("title", ""),
+            url=result["url"],
+            score=result.get("score", 0.0),
+        )
+        for result in res["results"]
+    ]
+    # Snippets only go into the text, the artifact is checkpointed and stored on the thread row as well
     search_res_content = ""
-    search_res_content+= "web_search_answer_summary: "+ res["answer"]
-    for i in range(5):
-        search_res_content+= f"web_search_source-{i+1}: " + res["results"][i]["content"] + "\n"
-    
-    return search_res_content
+    search_res_content+= "web_search_answer_summary: "+ (res.get("answer") or "") + "\n"
+    for i, result in enumerate(res["results"]):
+        search_res_content+= f"web_search_source-{i+1}: " + result["content"] + "\n"
+
+    return search_res_content, sources
 
 
-def create_web_search_agent():
+@lru_cache(maxsize=None)
+def create_web_search_agent(llm_model: str):
     tools_web_search = [get_web_search_results]
-    sport_event_info = ChatOpenAI(model="gpt-4o-mini").bind_tools(tools_web_search)
+    sport_event_info = RecordingChatOpenAI(model=llm_model).bind_tools(tools_web_search)
+    system_message = SystemMessage(content=WEB_SEARCH_AGENT_PROMPT)
 
 
-    async def call_sport_event_web_search_tool(state: OverallState):
-        local_messages = state.get("messages", [])
-        if not local_messages:
-            human_message = HumanMessage(content=state["web_search_query"])
-            local_messages.append(human_message)
+    async def call_sport_event_web_search_tool(state: OverallState, config: RunnableConfig):
+        messages = state.get("messages", [])
+        # Only the new messages are returned, the add reducer appends them to the history
+        new_messages = [] if messages else [HumanMessage(content=state["web_search_query"])]
 
-        system_message = SystemMessage(
-            content="""You are an agent tasked with fetching information about a sports event.
-            If the information about the sports event is available, return it. Otherwise, return 'Sports event information not available.'"""
+        response = await run_with_deadline(
+            sport_event_info.ainvoke([system_message] + messages + new_messages, config),
+            config,
+            LLM_TIMEOUT_SECONDS,
         )
 
-        response = await sport_event_info.ainvoke([system_message] + local_messages)
-
-        state["agent_output"] = response.content
-        state["messages"] = local_messages + [response]
-
-        return state
+        sources = [
+            source
+            for message in messages
+            if isinstance(message, ToolMessage)
+            for source in (message.artifact or [])
+        ]
+        return {
+            "messages": new_messages + [response],
+            "agent_output": response.content,
+            "sources": sources,
+        }
 
     def should_continue(state: OverallState) -> Literal["tools", END]: # type: ignore
         last_message = state["messages"][-1]
@@ -1,11 +1,17 @@
+from functools import lru_cache
 from typing import TypedDict
 
 from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from typing import Annotated, List, TypedDict
 from operator import add
 
+from .deadlines import LLM_TIMEOUT_SECONDS, run_with_deadline
+from .recorder import RecordingChatOpenAI
+
+WEB_SEARCH_QUERY_GENERATOR_PROMPT = "You are a web search query generator agent. Generate a web search query to do web search about a sports event mentioned below. The query should be regarding the sports event summary."
+
 
 class InputState(TypedDict):
     event: str
@@ -19,17 +25,19 @@ class OverallState(InputState, OutputState):
     pass
 
 
-def create_web_search_query_generator_agent():
-    model_query_generator = ChatOpenAI(model="gpt-4o-mini")
+@lru_cache(maxsize=None)
+def create_web_search_query_generator_agent(llm_model: str):
+    model_query_generator = RecordingChatOpenAI(model=llm_model)
+    system_message = SystemMessage(content=WEB_SEARCH_QUERY_GENERATOR_PROMPT)
 
-    async def generate_web_search_query(state: OverallState):
+    async def generate_web_search_query(state: OverallState, config: RunnableConfig):
         human_message = HumanMessage(content=state["event"])
-        system_message = SystemMessage(
-            content="You are a web search query generator agent. Generate a web search query to do web search about a sports event mentioned below. The query should be regarding the sports event summary."
+        response = await run_with_deadline(
+            model_query_generator.ainvoke([system_message, human_message], config),
+            config,
+            LLM_TIMEOUT_SECONDS,
         )
-        response = await model_query_generator.ainvoke([system_message, human_message])
-        state["agent_output"] = response.content
-        return state
+        return {"agent_output": response.content}
 
     web_search_query_generator_graph = StateGraph(OverallState, input=InputState, output=OutputState)
     web_search_query_generator_graph.add_node("web_search_query_generator", generate_web_search_query)